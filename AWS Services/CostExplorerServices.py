@@ -0,0 +1,284 @@
+import os
+import boto3
+import numpy as np
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Nome usado no cache para as consultas sem agrupamento (custo total da conta)
+TOTAL_GROUP_BY = 'TOTAL'
+
+# Colunas do cache local, todas armazenadas como arrays NumPy
+CACHE_COLUMNS = ('date', 'metric', 'group_by', 'group', 'amount', 'estimated')
+
+
+def _empty_columns():
+    return {
+        'date': np.array([], dtype='datetime64[D]'),
+        'metric': np.array([], dtype=str),
+        'group_by': np.array([], dtype=str),
+        'group': np.array([], dtype=str),
+        'amount': np.array([], dtype=np.float64),
+        'estimated': np.array([], dtype=bool),
+    }
+
+
+def _split_ranges(days, chunk_days):
+    """
+    Agrupa dias em intervalos contínuos [início, fim) de no máximo chunk_days dias.
+
+    :param days: Lista ordenada de datas (datetime.date).
+    :param chunk_days: Tamanho máximo de cada intervalo.
+    :return: Lista de tuplas (início, fim).
+    """
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] == day and (ranges[-1][1] - ranges[-1][0]).days < chunk_days:
+            ranges[-1][1] = day + timedelta(days=1)
+        else:
+            ranges.append([day, day + timedelta(days=1)])
+    return [tuple(r) for r in ranges]
+
+
+class CostExplorerCacheClass:
+    def __init__(self, cache_path='cost_cache.npz', max_workers=4):
+        """
+        Inicializa o cache local e colunar dos custos diários do Cost Explorer.
+
+        :param cache_path: Caminho do arquivo .npz onde as colunas do cache são salvas (a extensão
+                           .npz é acrescentada se faltar, como faz o np.savez_compressed).
+        :param max_workers: Número de requisições simultâneas ao Cost Explorer.
+        """
+        # O np.savez_compressed acrescenta .npz ao nome; normaliza para que o cache seja encontrado ao recarregar
+        if not cache_path.endswith('.npz'):
+            cache_path += '.npz'
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+
+        # Inicia o serviço Cost Explorer
+        self.ce_client = boto3.client('ce', region_name='us-east-1')
+
+        # Carrega o cache salvo anteriormente, se existir
+        self.columns = _empty_columns()
+        if os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as data:
+                self.columns = {name: data[name] for name in CACHE_COLUMNS}
+
+    def save(self):
+        """
+        Salva as colunas do cache no arquivo .npz.
+
+        :return: None
+        """
+        np.savez_compressed(self.cache_path, **self.columns)
+
+    def _key_mask(self, metric, group_by):
+        return (self.columns['metric'] == metric) & (self.columns['group_by'] == group_by)
+
+    def _days_to_fetch(self, start, end, metrics, group_by, mutable_days):
+        """
+        Calcula os dias do intervalo que faltam no cache ou que ainda podem mudar.
+
+        Um dia é buscado novamente se não estiver no cache para alguma métrica, se a AWS o
+        marcou como estimado ou se estiver entre os últimos mutable_days dias.
+
+        :return: Lista ordenada de datas (datetime.date).
+        """
+        requested = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D'))
+        fetch = np.zeros(len(requested), dtype=bool)
+
+        for metric in metrics:
+            mask = self._key_mask(metric, group_by)
+            cached = np.unique(self.columns['date'][mask & ~self.columns['estimated']])
+            fetch |= ~np.isin(requested, cached)
+
+        # Os custos dos dias mais recentes ainda são atualizados pela AWS
+        fetch |= requested >= np.datetime64(date.today() - timedelta(days=mutable_days), 'D')
+        return [day.astype(object) for day in requested[fetch]]
+
+    def _fetch_range(self, start, end, metrics, group_by):
+        """
+        Busca um intervalo diário no Cost Explorer, percorrendo todas as páginas (NextPageToken).
+
+        :return: Lista de linhas (data, métrica, grupo, valor, estimado).
+        """
+        request = {
+            'TimePeriod': {'Start': start.isoformat(), 'End': end.isoformat()},
+            'Granularity': 'DAILY',
+            'Metrics': list(metrics),
+        }
+        if group_by != TOTAL_GROUP_BY:
+            request['GroupBy'] = [{'Type': 'DIMENSION', 'Key': group_by}]
+
+        rows = []
+        while True:
+            response = self.ce_client.get_cost_and_usage(**request)
+
+            for result in response['ResultsByTime']:
+                day = result['TimePeriod']['Start']
+                estimated = result.get('Estimated', False)
+
+                if group_by == TOTAL_GROUP_BY:
+                    groups = [('', result['Total'])]
+                else:
+                    groups = [(group['Keys'][0], group['Metrics']) for group in result['Groups']]
+
+                    # Dias sem custo ficam registrados com um grupo vazio para não serem buscados de novo
+                    if not groups:
+                        groups = [('', {metric: {'Amount': '0'} for metric in metrics})]
+
+                for group, values in groups:
+                    for metric in metrics:
+                        rows.append((day, metric, group, float(values[metric]['Amount']), estimated))
+
+            # Continua enquanto houver páginas
+            if 'NextPageToken' not in response:
+                return rows
+            request['NextPageToken'] = response['NextPageToken']
+
+    def refresh(self, start, end, metrics=('UnblendedCost',), group_by='SERVICE', mutable_days=3, chunk_days=30):
+        """
+        Atualiza o cache buscando apenas os dias ausentes ou ainda mutáveis do intervalo.
+
+        Os dias a buscar são agrupados em intervalos de até chunk_days dias, requisitados em paralelo.
+
+        :param start: Data inicial (datetime.date), inclusiva.
+        :param end: Data final (datetime.date), exclusiva.
+        :param metrics: Métricas do Cost Explorer (ex.: 'UnblendedCost', 'UsageQuantity').
+        :param group_by: Dimensão de agrupamento (ex.: 'SERVICE') ou TOTAL_GROUP_BY.
+        :param mutable_days: Quantidade de dias recentes sempre buscados novamente.
+        :param chunk_days: Tamanho máximo de cada requisição, em dias.
+        :return: Número de dias atualizados, ou None em caso de erro.
+        """
+        days = self._days_to_fetch(start, end, metrics, group_by, mutable_days)
+        if not days:
+            return 0
+
+        ranges = _split_ranges(days, chunk_days)
+        try:
+            # Busca os intervalos em paralelo; o cliente do boto3 pode ser compartilhado entre threads
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(lambda r: self._fetch_range(r[0], r[1], metrics, group_by), ranges)
+                rows = [row for result in results for row in result]
+
+        except (BotoCoreError, ClientError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro e mantém o cache anterior
+            print(f"Erro ao buscar custos no Cost Explorer: {e}")
+            return None
+
+        # Remove as linhas antigas dos dias atualizados antes de anexar as novas
+        fetched = np.array(days, dtype='datetime64[D]')
+        stale = np.zeros(len(self.columns['date']), dtype=bool)
+        for metric in metrics:
+            stale |= self._key_mask(metric, group_by) & np.isin(self.columns['date'], fetched)
+
+        new_columns = {
+            'date': np.array([row[0] for row in rows], dtype='datetime64[D]'),
+            'metric': np.array([row[1] for row in rows], dtype=str),
+            'group_by': np.full(len(rows), group_by),
+            'group': np.array([row[2] for row in rows], dtype=str),
+            'amount': np.array([row[3] for row in rows], dtype=np.float64),
+            'estimated': np.array([row[4] for row in rows], dtype=bool),
+        }
+        self.columns = {
+            name: np.concatenate([self.columns[name][~stale], new_columns[name]])
+            for name in CACHE_COLUMNS
+        }
+        self.save()
+        return len(days)
+
+    def _select(self, metric, group_by, start=None, end=None):
+        """
+        Seleciona as linhas do cache de uma métrica e agrupamento no intervalo informado.
+
+        :return: Tupla de arrays (datas, grupos, valores).
+        """
+        mask = self._key_mask(metric, group_by)
+        if start is not None:
+            mask &= self.columns['date'] >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= self.columns['date'] < np.datetime64(end, 'D')
+        return self.columns['date'][mask], self.columns['group'][mask], self.columns['amount'][mask]
+
+    def _daily_totals(self, metric, start=None, end=None):
+        """
+        Seleciona os custos diários totais, somando as linhas por serviço quando não há linhas TOTAL.
+
+        :return: Tupla de arrays (datas, valores).
+        :raises ValueError: Se não houver linhas TOTAL nem SERVICE em cache para a métrica.
+        """
+        if not self._key_mask(metric, TOTAL_GROUP_BY).any():
+            if not self._key_mask(metric, 'SERVICE').any():
+                raise ValueError(
+                    f"Nenhum custo de {metric} em cache; execute refresh com group_by='SERVICE' ou TOTAL_GROUP_BY."
+                )
+            # A soma dos serviços de cada dia é o custo total do dia
+            dates, _, amounts = self._select(metric, 'SERVICE', start, end)
+            return dates, amounts
+
+        dates, _, amounts = self._select(metric, TOTAL_GROUP_BY, start, end)
+        return dates, amounts
+
+    def monthly_totals(self, metric='UnblendedCost', start=None, end=None):
+        """
+        Soma os custos diários por mês, sem novas chamadas à API.
+
+        Usa as linhas TOTAL_GROUP_BY quando existirem; caso contrário soma as linhas por serviço
+        gravadas pelo refresh padrão (group_by='SERVICE').
+
+        :param metric: Métrica do Cost Explorer.
+        :param start: Data inicial (inclusiva) ou None.
+        :param end: Data final (exclusiva) ou None.
+        :return: Dicionário {'AAAA-MM': total}.
+        """
+        dates, amounts = self._daily_totals(metric, start, end)
+        months, inverse = np.unique(dates.astype('datetime64[M]'), return_inverse=True)
+        totals = np.bincount(inverse, weights=amounts, minlength=len(months))
+        return {str(month): float(total) for month, total in zip(months, totals)}
+
+    def top_services(self, n=5, metric='UnblendedCost', start=None, end=None):
+        """
+        Retorna os n serviços de maior custo no intervalo, sem novas chamadas à API.
+
+        :param n: Quantidade de serviços.
+        :param metric: Métrica do Cost Explorer.
+        :param start: Data inicial (inclusiva) ou None.
+        :param end: Data final (exclusiva) ou None.
+        :return: Lista de tuplas (serviço, total) em ordem decrescente.
+        """
+        _, groups, amounts = self._select(metric, 'SERVICE', start, end)
+        services, inverse = np.unique(groups, return_inverse=True)
+        totals = np.bincount(inverse, weights=amounts, minlength=len(services))
+
+        order = np.argsort(totals)[::-1]
+        return [(str(services[i]), float(totals[i])) for i in order if services[i]][:n]
+
+    def compare_forecast(self, forecast_amount, metric='UnblendedCost', lookback_days=14):
+        """
+        Compara a previsão do mês (ex.: get_cost_forecast) com a projeção local pelo ritmo diário.
+
+        A projeção soma o custo já registrado no mês atual com a média dos últimos
+        lookback_days dias multiplicada pelos dias restantes do mês.
+
+        :param forecast_amount: Valor previsto para o mês atual.
+        :param metric: Métrica do Cost Explorer.
+        :param lookback_days: Dias usados no cálculo da média diária.
+        :return: Dicionário com o custo do mês até hoje, a projeção local, a previsão e a diferença.
+        """
+        today = np.datetime64(date.today(), 'D')
+        month_start = today.astype('datetime64[M]').astype('datetime64[D]')
+        next_month = (today.astype('datetime64[M]') + 1).astype('datetime64[D]')
+
+        dates, amounts = self._daily_totals(metric)
+        month_to_date = float(amounts[(dates >= month_start) & (dates < today)].sum())
+
+        recent = amounts[(dates >= today - lookback_days) & (dates < today)]
+        daily_rate = float(recent.sum()) / lookback_days if len(recent) else 0.0
+        projection = month_to_date + daily_rate * int((next_month - today).astype(int))
+
+        return {
+            'month_to_date': month_to_date,
+            'local_projection': projection,
+            'forecast': float(forecast_amount),
+            'difference': float(forecast_amount) - projection,
+        }
@@ -1,3 +1,4 @@
+import time
 import boto3
 from datetime import datetime
 from boto3.dynamodb.conditions import Key, Attr
@@ -157,10 +158,11 @@ class DynamoDBClass:
             return None
 
 
-    def import_table_dynamodb(self):
+    def import_table_dynamodb(self, serializer=None):
         """
         Escaneia a tabela DynamoDB para obter todos os itens.
 
+        :param serializer: Instância opcional de DynamoDBSchemaSerializer para converter cada página em valores Python.
         :return: Lista de itens da tabela
         """
         results = []
@@ -181,8 +183,11 @@ class DynamoDBClass:
             # Atualiza a última chave avaliada
             last_evaluated_key = response.get('LastEvaluatedKey')
             
-            # Adiciona os itens escaneados à lista de resultados
-            results.extend(response['Items'])
+            # Adiciona os itens escaneados à lista de resultados, convertendo a página inteira se houver esquema
+            if serializer is not None:
+                results.extend(serializer.deserialize_page(response['Items']))
+            else:
+                results.extend(response['Items'])
             
             # Se não houver mais chaves a serem avaliadas, saia do loop
             if not last_evaluated_key:
@@ -190,3 +195,43 @@ class DynamoDBClass:
         
         # Retorna a lista de itens da tabela
         return results
+
+    def batch_write_dynamodb(self, items, serializer, max_attempts=8, base_delay=0.05):
+        """
+        Grava vários itens na tabela usando batch_write_item com os itens já serializados.
+
+        Os itens não processados (ex.: por throttling) são reenviados com espera exponencial.
+
+        :param items: Lista de itens Python.
+        :param serializer: Instância de DynamoDBSchemaSerializer com o esquema da tabela.
+        :param max_attempts: Número máximo de envios de cada lote.
+        :param base_delay: Espera inicial, em segundos, antes de reenviar os itens não processados.
+        :return: True se todos os itens forem gravados, False em caso de erro ou se sobrarem itens não processados.
+        """
+        # Serializa todos os itens de uma vez com os conversores compilados do esquema
+        requests = [{'PutRequest': {'Item': item}} for item in serializer.serialize_page(items)]
+
+        try:
+            # O batch_write_item aceita no máximo 25 itens por chamada
+            for start in range(0, len(requests), 25):
+                pending = {self.dynamodb_table_name: requests[start:start + 25]}
+
+                # Reenvia os itens não processados, dobrando a espera a cada tentativa
+                for attempt in range(max_attempts):
+                    response = self.dynamodb_client.batch_write_item(RequestItems=pending)
+                    pending = response.get('UnprocessedItems')
+                    if not pending:
+                        break
+                    if attempt < max_attempts - 1:
+                        time.sleep(base_delay * 2 ** attempt)
+
+                if pending:
+                    unprocessed = sum(len(batch) for batch in pending.values())
+                    print(f"Erro ao gravar os itens em lote no DynamoDB: {unprocessed} itens não processados após {max_attempts} tentativas")
+                    return False
+
+        except (BotoCoreError, ClientError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro
+            print(f"Erro ao gravar os itens em lote no DynamoDB: {e}")
+            return False
+        return True
@@ -0,0 +1,435 @@
+import os
+import time
+import socket
+import tempfile
+import subprocess
+import threading
+import boto3
+import paramiko
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Limite de IDs por chamada do describe_instances
+DESCRIBE_BATCH_SIZE = 1000
+
+# Estados dos quais uma instância não chega mais a running
+TERMINAL_STATES = ('shutting-down', 'terminated', 'stopping', 'stopped')
+
+# Intervalo máximo, em segundos, de espera pelo stdout antes de verificar o stderr novamente
+STREAM_POLL_INTERVAL = 0.05
+
+
+class EC2FleetClass:
+    def __init__(self, key_filename=None, username='ubuntu', ec2_client=None, connect_timeout=10,
+                 max_workers=16, ssh_client_factory=paramiko.SSHClient):
+        """
+        Inicializa a classe EC2FleetClass com o cliente EC2 e o pool de conexões SSH.
+
+        :param key_filename: Caminho da chave privada (.pem) usada nas conexões SSH.
+        :param username: Usuário SSH das instâncias (ex.: 'ubuntu', 'ec2-user').
+        :param ec2_client: Cliente EC2 já criado (ex.: uma API falsa em testes). Se None, cria um cliente boto3.
+        :param connect_timeout: Tempo máximo, em segundos, para abrir cada conexão SSH.
+        :param max_workers: Número de hosts atendidos em paralelo.
+        :param ssh_client_factory: Classe usada para criar as conexões (padrão: paramiko.SSHClient).
+        """
+        self.key_filename = key_filename
+        self.username = username
+        self.connect_timeout = connect_timeout
+        self.max_workers = max_workers
+        self.ssh_client_factory = ssh_client_factory
+
+        # Inicia o serviço EC2
+        self.ec2_client = ec2_client or boto3.client('ec2', region_name='us-east-1')
+
+        # Pool de conexões SSH persistentes, uma por host
+        self.connections = {}
+        self.pool_lock = threading.Lock()
+
+    def launch_instances(self, count, image_id, instance_type='t2.nano', key_name=None, security_group_ids=None):
+        """
+        Lança N instâncias EC2 em uma única chamada.
+
+        :param count: Número de instâncias.
+        :param image_id: ID da AMI.
+        :param instance_type: Tipo da instância.
+        :param key_name: Nome do key pair usado no acesso SSH.
+        :param security_group_ids: Lista de IDs dos security groups.
+        :return: Lista de IDs das instâncias, ou None em caso de erro.
+        """
+        request = {'ImageId': image_id, 'MinCount': count, 'MaxCount': count, 'InstanceType': instance_type}
+        if key_name is not None:
+            request['KeyName'] = key_name
+        if security_group_ids is not None:
+            request['SecurityGroupIds'] = security_group_ids
+
+        try:
+            response = self.ec2_client.run_instances(**request)
+            return [instance['InstanceId'] for instance in response['Instances']]
+        except (BotoCoreError, ClientError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro
+            print(f"Erro ao lançar as instâncias: {e}")
+            return None
+
+    def find_instances(self, filters):
+        """
+        Busca instâncias existentes pelos filtros do describe_instances (ex.: tags).
+
+        :param filters: Lista de filtros, ex.: [{'Name': 'tag:Fleet', 'Values': ['workers']}].
+        :return: Dicionário {instance_id: estado}.
+        """
+        instances = {}
+        paginator = self.ec2_client.get_paginator('describe_instances')
+        for page in paginator.paginate(Filters=filters):
+            for reservation in page['Reservations']:
+                for instance in reservation['Instances']:
+                    instances[instance['InstanceId']] = instance['State']['Name']
+        return instances
+
+    def wait_running(self, instance_ids, timeout=300, poll_interval=5):
+        """
+        Aguarda as instâncias entrarem no estado running com um único describe_instances por rodada.
+
+        Logo após o run_instances, o EC2 pode ainda não reconhecer os IDs (InvalidInstanceID.NotFound);
+        nesse caso o lote é consultado de novo na próxima rodada.
+
+        :param instance_ids: Lista de IDs das instâncias.
+        :param timeout: Tempo máximo de espera, em segundos.
+        :param poll_interval: Intervalo entre as consultas, em segundos.
+        :return: Dicionário {instance_id: IP público (ou privado, se não houver público)}.
+        """
+        pending = list(instance_ids)
+        addresses = {}
+        deadline = time.monotonic() + timeout
+
+        while pending:
+            # Consulta todas as instâncias pendentes de uma vez, em lotes de até 1000 IDs
+            for start in range(0, len(pending), DESCRIBE_BATCH_SIZE):
+                batch = pending[start:start + DESCRIBE_BATCH_SIZE]
+                try:
+                    response = self.ec2_client.describe_instances(InstanceIds=batch)
+                except ClientError as e:
+                    # As leituras do EC2 são eventualmente consistentes: IDs recém-criados podem não existir ainda
+                    if e.response['Error']['Code'] != 'InvalidInstanceID.NotFound':
+                        raise
+                    continue
+
+                for reservation in response['Reservations']:
+                    for instance in reservation['Instances']:
+                        state = instance['State']['Name']
+                        if state == 'running':
+                            addresses[instance['InstanceId']] = instance.get('PublicIpAddress') or instance.get('PrivateIpAddress')
+                        elif state in TERMINAL_STATES:
+                            raise RuntimeError(f"Instância {instance['InstanceId']} não vai iniciar (estado: {state})")
+
+            pending = [instance_id for instance_id in pending if instance_id not in addresses]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Instâncias não ficaram prontas a tempo: {pending}")
+            time.sleep(poll_interval)
+
+        return addresses
+
+    def _connection(self, host, port=22):
+        """
+        Retorna a conexão SSH do pool para o host, abrindo-a apenas se não existir ou tiver caído.
+
+        :param host: Endereço do host.
+        :param port: Porta SSH.
+        :return: Instância de paramiko.SSHClient conectada.
+        """
+        with self.pool_lock:
+            client = self.connections.get((host, port))
+
+        transport = client.get_transport() if client is not None else None
+        if transport is not None and transport.is_active():
+            return client
+
+        # Conexão caída: fecha o cliente antigo antes de abrir outro
+        if client is not None:
+            client.close()
+
+        client = self.ssh_client_factory()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            hostname=host, port=port, username=self.username, key_filename=self.key_filename,
+            timeout=self.connect_timeout, banner_timeout=self.connect_timeout, auth_timeout=self.connect_timeout
+        )
+        with self.pool_lock:
+            self.connections[(host, port)] = client
+        return client
+
+    def run_on_host(self, host, command, timeout=30, on_output=None, port=22):
+        """
+        Executa um comando em um host usando a conexão do pool, repassando a saída linha a linha.
+
+        :param host: Endereço do host.
+        :param command: Comando a ser executado.
+        :param timeout: Tempo máximo, em segundos, para o comando terminar.
+        :param on_output: Função chamada como on_output(host, linha) a cada linha do stdout.
+        :param port: Porta SSH.
+        :return: Tupla (código de saída, stdout, stderr).
+        """
+        deadline = time.monotonic() + timeout
+        channel = self._connection(host, port).get_transport().open_session(timeout=timeout)
+
+        try:
+            channel.exec_command(command)
+            stdout, stderr, pending = [], [], b''
+
+            while True:
+                # Esvazia o stderr a cada volta para que a janela SSH não encha e trave o comando
+                while channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(32768))
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Comando excedeu {timeout}s em {host}")
+
+                # Aguarda o próximo bloco do stdout por pouco tempo; bytes vazios indicam o fim da saída
+                channel.settimeout(min(remaining, STREAM_POLL_INTERVAL))
+                try:
+                    data = channel.recv(32768)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+
+                stdout.append(data)
+                if on_output is not None:
+                    *lines, pending = (pending + data).split(b'\n')
+                    for line in lines:
+                        on_output(host, line.decode('utf-8', 'replace'))
+
+            if on_output is not None and pending:
+                on_output(host, pending.decode('utf-8', 'replace'))
+
+            # O fim da saída vale para os dois fluxos: lê o que restou do stderr
+            while channel.recv_stderr_ready():
+                stderr.append(channel.recv_stderr(32768))
+
+            exit_status = channel.recv_exit_status()
+            return exit_status, b''.join(stdout).decode('utf-8', 'replace'), b''.join(stderr).decode('utf-8', 'replace')
+        finally:
+            channel.close()
+
+    def run(self, hosts, command, timeout=30, on_output=None, port=22):
+        """
+        Executa um comando em todos os hosts da frota ao mesmo tempo.
+
+        :param hosts: Lista de endereços dos hosts.
+        :param command: Comando a ser executado.
+        :param timeout: Tempo máximo, em segundos, por host.
+        :param on_output: Função chamada como on_output(host, linha) conforme a saída chega.
+        :param port: Porta SSH.
+        :return: Dicionário {host: (código de saída, stdout, stderr)} ou {host: exceção} em caso de falha.
+        """
+        def run_host(host):
+            try:
+                return self.run_on_host(host, command, timeout, on_output, port)
+            except (paramiko.SSHException, OSError, TimeoutError) as e:
+                # Falha em um host não interrompe os demais; a conexão é descartada do pool
+                print(f"Erro ao executar o comando em {host}: {e}")
+                self._discard(host, port)
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(hosts, executor.map(run_host, hosts)))
+
+    def _discard(self, host, port=22):
+        with self.pool_lock:
+            client = self.connections.pop((host, port), None)
+        if client is not None:
+            client.close()
+
+    def close(self):
+        """
+        Fecha todas as conexões SSH do pool.
+
+        :return: None
+        """
+        with self.pool_lock:
+            clients = list(self.connections.values())
+            self.connections.clear()
+        for client in clients:
+            client.close()
+
+
+def benchmark_fleet(fleet, hosts, command='true', repeat=5, port=22):
+    """
+    Compara a latência de um comando em toda a frota com conexões do pool e reconectando a cada comando.
+
+    :param fleet: Instância de EC2FleetClass.
+    :param hosts: Lista de endereços dos hosts.
+    :param command: Comando executado em cada rodada.
+    :param repeat: Número de rodadas de cada modo.
+    :param port: Porta SSH.
+    :return: Dicionário com a latência média, em segundos, de cada modo.
+    """
+    def average(reconnect):
+        fleet.close()
+        fleet.run(hosts, command, port=port)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if reconnect:
+                fleet.close()
+            fleet.run(hosts, command, port=port)
+        return (time.perf_counter() - start) / repeat
+
+    results = {'pooled': average(reconnect=False), 'reconnect_per_command': average(reconnect=True)}
+    fleet.close()
+    return results
+
+
+class LocalSSHServer(paramiko.ServerInterface):
+    def __init__(self, host='127.0.0.1'):
+        """
+        Servidor SSH local (paramiko) que substitui as instâncias EC2 em testes e benchmarks.
+
+        Aceita qualquer usuário e chave e executa os comandos no shell local, enviando stdout e
+        stderr separadamente e o código de saída ao final.
+
+        :param host: Endereço em que o servidor escuta; a porta é escolhida pelo sistema.
+        """
+        self.host_key = paramiko.RSAKey.generate(2048)
+
+        # Chave do cliente gravada em um arquivo temporário, usada como key_filename da frota
+        self.client_key = paramiko.RSAKey.generate(2048)
+        key_file = tempfile.NamedTemporaryFile('w', suffix='.pem', delete=False)
+        self.client_key.write_private_key(key_file)
+        key_file.close()
+        self.key_filename = key_file.name
+
+        self.socket = socket.socket()
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, 0))
+        self.socket.listen(100)
+        self.host, self.port = self.socket.getsockname()
+
+        self.transports = []
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                return
+            # Sem o atraso do algoritmo de Nagle, que somaria dezenas de ms a cada comando
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(connection)
+            transport.add_server_key(self.host_key)
+            transport.start_server(server=self)
+            self.transports.append(transport)
+
+    def get_allowed_auths(self, username):
+        return 'publickey'
+
+    def check_auth_publickey(self, username, key):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self._execute, args=(channel, command.decode('utf-8')), daemon=True).start()
+        return True
+
+    def _execute(self, channel, command):
+        """
+        Executa o comando localmente, repassando stdout e stderr ao mesmo tempo para não travar o processo.
+        """
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        def forward_stderr():
+            for block in iter(lambda: process.stderr.read1(32768), b''):
+                channel.sendall_stderr(block)
+
+        stderr_thread = threading.Thread(target=forward_stderr, daemon=True)
+        stderr_thread.start()
+        for block in iter(lambda: process.stdout.read1(32768), b''):
+            channel.sendall(block)
+        stderr_thread.join()
+
+        channel.send_exit_status(process.wait())
+        channel.close()
+
+    def close(self):
+        """
+        Encerra o servidor, as conexões abertas e remove a chave temporária.
+        """
+        self.socket.close()
+        for transport in self.transports:
+            transport.close()
+        os.remove(self.key_filename)
+
+
+class FakeEC2Client:
+    def __init__(self, address='127.0.0.1', pending_polls=1, not_found_polls=1):
+        """
+        API EC2 falsa com o subconjunto usado pela EC2FleetClass.
+
+        Simula a consistência eventual do EC2: os IDs recém-criados geram InvalidInstanceID.NotFound
+        nas primeiras not_found_polls consultas e ficam 'pending' nas pending_polls seguintes.
+
+        :param address: IP retornado como PublicIpAddress de todas as instâncias.
+        :param pending_polls: Número de consultas em que a instância aparece como 'pending'.
+        :param not_found_polls: Número de consultas que retornam InvalidInstanceID.NotFound.
+        """
+        self.address = address
+        self.pending_polls = pending_polls
+        self.not_found_polls = not_found_polls
+        self.instances = {}
+        self.describe_calls = 0
+
+    def run_instances(self, MinCount, MaxCount, **kwargs):
+        ids = [f"i-{len(self.instances) + n:017x}" for n in range(MaxCount)]
+        for instance_id in ids:
+            self.instances[instance_id] = {'polls': 0, 'tags': kwargs.get('TagSpecifications', [])}
+        return {'Instances': [{'InstanceId': instance_id} for instance_id in ids]}
+
+    def _describe(self, instance_id):
+        instance = self.instances[instance_id]
+        instance['polls'] += 1
+        state = 'pending' if instance['polls'] <= self.not_found_polls + self.pending_polls else 'running'
+        return {'InstanceId': instance_id, 'State': {'Name': state}, 'PublicIpAddress': self.address}
+
+    def describe_instances(self, InstanceIds):
+        self.describe_calls += 1
+        unknown = [i for i in InstanceIds if i not in self.instances]
+        fresh = [i for i in InstanceIds if i in self.instances and self.instances[i]['polls'] < self.not_found_polls]
+        if unknown or fresh:
+            for instance_id in fresh:
+                self.instances[instance_id]['polls'] += 1
+            raise ClientError(
+                {'Error': {'Code': 'InvalidInstanceID.NotFound', 'Message': f"IDs não encontrados: {unknown or fresh}"}},
+                'DescribeInstances'
+            )
+        return {'Reservations': [{'Instances': [self._describe(i) for i in InstanceIds]}]}
+
+    def get_paginator(self, operation_name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Filters=None):
+                yield fake.describe_instances(InstanceIds=list(fake.instances))
+
+        return Paginator()
+
+
+if __name__ == '__main__':
+    # Benchmark reproduzível: frota falsa apontando para servidores SSH locais
+    servers = [LocalSSHServer() for _ in range(4)]
+    ec2 = FakeEC2Client()
+    instance_ids = [ec2.run_instances(ImageId='ami-local', MinCount=1, MaxCount=1)['Instances'][0]['InstanceId'] for _ in servers]
+
+    # Cada servidor escuta em uma porta diferente do mesmo host; a chave de cliente é a do primeiro
+    fleet = EC2FleetClass(key_filename=servers[0].key_filename, ec2_client=ec2)
+    print("Instâncias prontas:", fleet.wait_running(instance_ids, poll_interval=0.01))
+
+    for server in servers:
+        result = benchmark_fleet(fleet, [server.host], 'echo ok', repeat=10, port=server.port)
+        print(f"porta {server.port}: " + ", ".join(f"{mode} {seconds * 1000:.1f} ms" for mode, seconds in result.items()))
+
+    for server in servers:
+        server.close()
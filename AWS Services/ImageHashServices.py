@@ -0,0 +1,316 @@
+import io
+import json
+from itertools import combinations
+import numpy as np
+from PIL import Image
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Lado da imagem reduzida usada no cálculo do pHash
+PHASH_SIZE = 32
+
+# Lado do bloco de baixas frequências da DCT que compõe o hash de 64 bits
+PHASH_LOW_FREQ = 8
+
+
+def _dct_matrix(size):
+    """
+    Gera a matriz da DCT-II ortonormal usada no cálculo do pHash.
+
+    :param size: Dimensão da matriz quadrada.
+    :return: Matriz NumPy (size x size).
+    """
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0, :] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+# Matriz da DCT calculada uma única vez no carregamento do módulo
+DCT_MATRIX = _dct_matrix(PHASH_SIZE)
+
+
+def _load_gray(source, size):
+    """
+    Decodifica uma imagem e a reduz para tons de cinza no tamanho informado.
+
+    :param source: Caminho do arquivo, bytes ou imagem PIL.
+    :param size: Tupla (largura, altura) da imagem reduzida.
+    :return: Matriz NumPy float32 (altura x largura).
+    """
+    # Imagens recebidas do chamador não são alteradas: o draft reduziria a imagem original
+    if isinstance(source, Image.Image):
+        return np.asarray(source.convert('L').resize(size, Image.BILINEAR), dtype=np.float32)
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with Image.open(source) as image:
+        # Para JPEG, o draft reduz a imagem já na decodificação
+        image.draft('L', (size[0] * 4, size[1] * 4))
+        gray = image.convert('L').resize(size, Image.BILINEAR)
+    return np.asarray(gray, dtype=np.float32)
+
+
+def _pack_bits(bits):
+    """
+    Converte uma matriz (N x 64) de booleanos em hashes inteiros de 64 bits.
+
+    :param bits: Matriz NumPy de booleanos.
+    :return: Lista de inteiros Python.
+    """
+    packed = np.packbits(bits.astype(np.uint8), axis=1)
+    return [int(value) for value in packed.view('>u8').ravel()]
+
+
+def dhash_batch(sources):
+    """
+    Calcula o dHash (diferença entre pixels vizinhos) de várias imagens de forma vetorizada.
+
+    :param sources: Lista de caminhos, bytes ou imagens PIL.
+    :return: Lista de hashes de 64 bits.
+    """
+    pixels = np.stack([_load_gray(source, (9, 8)) for source in sources])
+    bits = pixels[:, :, 1:] > pixels[:, :, :-1]
+    return _pack_bits(bits.reshape(len(sources), -1))
+
+
+def phash_batch(sources):
+    """
+    Calcula o pHash (DCT de baixas frequências) de várias imagens de forma vetorizada.
+
+    :param sources: Lista de caminhos, bytes ou imagens PIL.
+    :return: Lista de hashes de 64 bits.
+    """
+    pixels = np.stack([_load_gray(source, (PHASH_SIZE, PHASH_SIZE)) for source in sources])
+
+    # DCT 2D de todas as imagens de uma vez: D @ X @ D^T
+    dct = np.einsum('ij,njk,lk->nil', DCT_MATRIX, pixels, DCT_MATRIX)
+    low = dct[:, :PHASH_LOW_FREQ, :PHASH_LOW_FREQ].reshape(len(sources), -1)
+
+    # Compara cada coeficiente com a mediana, ignorando o termo DC
+    medians = np.median(low[:, 1:], axis=1, keepdims=True)
+    return _pack_bits(low > medians)
+
+
+def dhash(source):
+    """
+    Calcula o dHash de uma única imagem.
+
+    :param source: Caminho do arquivo, bytes ou imagem PIL.
+    :return: Hash de 64 bits.
+    """
+    return dhash_batch([source])[0]
+
+
+def phash(source):
+    """
+    Calcula o pHash de uma única imagem.
+
+    :param source: Caminho do arquivo, bytes ou imagem PIL.
+    :return: Hash de 64 bits.
+    """
+    return phash_batch([source])[0]
+
+
+def _check_hash_function(saved_name, hash_function):
+    """
+    Garante que o índice salvo foi gerado com a mesma função de hash usada nas novas fotos.
+
+    :param saved_name: Nome da função gravado junto aos dados (None em arquivos antigos).
+    :param hash_function: Função de hash informada no carregamento.
+    :return: None
+    """
+    if saved_name is not None and saved_name != hash_function.__name__:
+        raise ValueError(
+            f"Índice gerado com {saved_name}, mas carregado com {hash_function.__name__}; "
+            "os hashes não são comparáveis."
+        )
+
+
+class NearDuplicateIndex:
+    def __init__(self, max_distance=6, hash_function=phash, chunks=4):
+        """
+        Inicializa o índice de quase-duplicatas por distância de Hamming (multi-index hashing).
+
+        O hash de 64 bits é dividido em blocos. Pelo princípio da casa dos pombos, duas imagens a
+        até max_distance bits de distância têm ao menos um bloco a até max_distance // chunks
+        bits de distância, então a busca consulta nos dicionários apenas as variações desse
+        bloco, sem varrer o índice. Blocos de 16 bits (chunks=4) mantêm poucos candidatos por
+        consulta mesmo com milhões de hashes.
+
+        :param max_distance: Distância de Hamming máxima para considerar duas fotos iguais.
+        :param hash_function: Função usada para calcular o hash das imagens (phash ou dhash).
+        :param chunks: Número de blocos em que o hash é dividido.
+        """
+        self.max_distance = max_distance
+        self.hash_function = hash_function
+
+        # Divide os 64 bits em blocos de tamanho aproximadamente igual
+        bounds = [round(64 * i / chunks) for i in range(chunks + 1)]
+        self.chunk_ranges = [(bounds[i], bounds[i + 1] - bounds[i]) for i in range(chunks)]
+
+        # Máscaras com até max_distance // chunks bits ligados, usadas para variar cada bloco
+        radius = max_distance // chunks
+        self.flip_masks = [
+            [sum(1 << bit for bit in bits) for r in range(radius + 1) for bits in combinations(range(width), r)]
+            for _, width in self.chunk_ranges
+        ]
+
+        # Uma tabela por bloco: valor do bloco -> hashes que possuem esse bloco
+        self.tables = [{} for _ in range(chunks)]
+
+        # Rótulos já obtidos do Rekognition para cada hash
+        self.labels = {}
+
+        # Hashes adicionados ou alterados desde o último load_dynamodb/save_dynamodb
+        self.unsaved_hashes = set()
+
+    def _chunks(self, image_hash):
+        """
+        Separa o hash nos blocos usados pelas tabelas do índice.
+
+        :param image_hash: Hash de 64 bits.
+        :return: Lista com o valor de cada bloco.
+        """
+        return [(image_hash >> shift) & ((1 << width) - 1) for shift, width in self.chunk_ranges]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add(self, image_hash, labels):
+        """
+        Adiciona um hash e seus rótulos ao índice.
+
+        :param image_hash: Hash de 64 bits da imagem.
+        :param labels: Rótulos (ou resposta do Rekognition) associados à imagem.
+        :return: None
+        """
+        if image_hash not in self.labels:
+            for table, chunk in zip(self.tables, self._chunks(image_hash)):
+                table.setdefault(chunk, []).append(image_hash)
+        self.labels[image_hash] = labels
+        self.unsaved_hashes.add(image_hash)
+
+    def query(self, image_hash):
+        """
+        Busca o hash mais próximo dentro da distância máxima configurada.
+
+        :param image_hash: Hash de 64 bits da imagem.
+        :return: Tupla (hash, distância, rótulos) do vizinho mais próximo ou None.
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for table, chunk, masks in zip(self.tables, self._chunks(image_hash), self.flip_masks):
+            for mask in masks:
+                for candidate in table.get(chunk ^ mask, ()):
+                    # Confirma a distância real comparando todos os bits
+                    distance = (candidate ^ image_hash).bit_count()
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+
+        if best is None:
+            return None
+        return best, best_distance, self.labels[best]
+
+    def get_or_analyze(self, image, analyze):
+        """
+        Reaproveita os rótulos de uma foto quase idêntica ou analisa a nova foto.
+
+        :param image: Caminho, bytes ou imagem PIL da foto recebida.
+        :param analyze: Função chamada sem argumentos para enviar a foto ao S3/Rekognition.
+        :return: Tupla (rótulos, True se reaproveitados do índice).
+        """
+        image_hash = self.hash_function(image)
+        match = self.query(image_hash)
+        if match is not None:
+            return match[2], True
+
+        labels = analyze()
+        if labels is not None:
+            self.add(image_hash, labels)
+        return labels, False
+
+    def save(self, path):
+        """
+        Salva o índice em um arquivo JSON local.
+
+        :param path: Caminho do arquivo de saída.
+        :return: None
+        """
+        data = {
+            'hash_function': self.hash_function.__name__,
+            'max_distance': self.max_distance,
+            'chunks': len(self.tables),
+            'items': [[f"{image_hash:016x}", labels] for image_hash, labels in self.labels.items()]
+        }
+        with open(path, 'w') as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path, hash_function=phash):
+        """
+        Carrega um índice salvo com save.
+
+        :param path: Caminho do arquivo JSON.
+        :param hash_function: Função de hash usada nas novas fotos.
+        :return: Instância de NearDuplicateIndex.
+        """
+        with open(path) as file:
+            data = json.load(file)
+        _check_hash_function(data.get('hash_function'), hash_function)
+
+        index = cls(max_distance=data['max_distance'], hash_function=hash_function, chunks=data.get('chunks', 4))
+        for hex_hash, labels in data['items']:
+            index.add(int(hex_hash, 16), labels)
+        return index
+
+    def save_dynamodb(self, dynamodb_class):
+        """
+        Persiste no DynamoDB os hashes novos ou alterados (chave 'id' = hash em hexadecimal).
+
+        Apenas os hashes adicionados desde o último load_dynamodb/save_dynamodb são gravados,
+        então salvar após uma nova foto custa uma escrita, e não a reescrita da tabela inteira.
+        Use uma tabela ao lado da tabela de log, por exemplo '<tabela-de-log>-hashes', criada
+        com DynamoDBClass.create_table_dynamodb.
+
+        :param dynamodb_class: Instância de DynamoDBClass apontando para a tabela de hashes.
+        :return: True se os itens forem gravados com sucesso, False em caso de erro.
+        """
+        table = dynamodb_class.dynamodb.Table(dynamodb_class.dynamodb_table_name)
+        pending = list(self.unsaved_hashes)
+        try:
+            # O batch_writer agrupa as gravações em lotes de 25 itens
+            with table.batch_writer() as batch:
+                for image_hash in pending:
+                    batch.put_item(Item={
+                        'id': f"{image_hash:016x}",
+                        'labels': json.dumps(self.labels[image_hash]),
+                        'hash_function': self.hash_function.__name__
+                    })
+        except (BotoCoreError, ClientError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro e mantém os hashes pendentes
+            print(f"Erro ao salvar o índice de hashes no DynamoDB: {e}")
+            return False
+
+        self.unsaved_hashes.difference_update(pending)
+        return True
+
+    @classmethod
+    def load_dynamodb(cls, dynamodb_class, max_distance=6, hash_function=phash, chunks=4):
+        """
+        Carrega o índice a partir de uma tabela do DynamoDB gravada com save_dynamodb.
+
+        :param dynamodb_class: Instância de DynamoDBClass apontando para a tabela de hashes.
+        :param max_distance: Distância de Hamming máxima para considerar duas fotos iguais.
+        :param hash_function: Função de hash usada nas novas fotos; deve ser a mesma usada nos itens salvos.
+        :param chunks: Número de blocos em que o hash é dividido.
+        :return: Instância de NearDuplicateIndex.
+        """
+        index = cls(max_distance=max_distance, hash_function=hash_function, chunks=chunks)
+        for item in dynamodb_class.import_table_dynamodb():
+            _check_hash_function(item.get('hash_function', {}).get('S'), hash_function)
+            index.add(int(item['id']['S'], 16), json.loads(item['labels']['S']))
+
+        # Os itens lidos já estão na tabela e não precisam ser gravados de novo
+        index.unsaved_hashes.clear()
+        return index
@@ -0,0 +1,135 @@
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image, ImageOps
+
+# Menor lado recomendado pelo Amazon Rekognition para detecção de rótulos e texto
+REKOGNITION_MIN_SIDE = 640
+
+# Limite de tamanho do parâmetro Image={'Bytes': ...} do Amazon Rekognition (5 MB)
+REKOGNITION_MAX_BYTES = 5 * 1024 * 1024
+
+# Qualidade JPEG fixa usada na recodificação. Com o menor lado em 640 px, qualquer qualidade
+# razoável fica muito abaixo de 5 MB, então não há uma escala de qualidades a percorrer
+JPEG_QUALITY = 85
+
+# Tag EXIF de orientação; o valor 1 (ou ausente) indica que a imagem não precisa ser girada
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def preprocess_image(source, min_side=REKOGNITION_MIN_SIDE, max_bytes=REKOGNITION_MAX_BYTES):
+    """
+    Decodifica, corrige a rotação EXIF e reduz uma imagem para o tamanho recomendado pelo Rekognition.
+
+    A imagem é reduzida até que o menor lado tenha min_side pixels (nunca é ampliada) e
+    recodificada em JPEG com qualidade JPEG_QUALITY. Um JPEG que já está nesse tamanho, sem
+    rotação EXIF e dentro de max_bytes é devolvido sem alteração, já que recodificá-lo só
+    perderia qualidade e poderia aumentar o arquivo.
+
+    :param source: Caminho do arquivo de imagem ou bytes da imagem original.
+    :param min_side: Menor lado, em pixels, a ser preservado após o redimensionamento.
+    :param max_bytes: Tamanho máximo, em bytes, do JPEG gerado.
+    :return: Bytes do JPEG pré-processado.
+    """
+    if not isinstance(source, (bytes, bytearray)):
+        with open(source, 'rb') as file:
+            source = file.read()
+    original = bytes(source)
+
+    with Image.open(io.BytesIO(original)) as image:
+        width, height = image.size
+
+        # JPEG já pequeno e sem rotação: envia os bytes originais
+        if (image.format == 'JPEG' and min(width, height) <= min_side and len(original) <= max_bytes
+                and image.getexif().get(EXIF_ORIENTATION_TAG, 1) == 1):
+            return original
+
+        # Para JPEG, pede ao decodificador uma escala reduzida (1/2, 1/4, 1/8) já na leitura
+        scale = min_side / min(width, height)
+        if scale < 1:
+            image.draft('RGB', (int(width * scale) + 1, int(height * scale) + 1))
+
+        # Aplica a orientação EXIF, já que o Rekognition não considera essa tag em Bytes
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+        # Reduz a imagem mantendo a proporção até o menor lado recomendado
+        width, height = image.size
+        scale = min_side / min(width, height)
+        if scale < 1:
+            new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = image.resize(new_size, Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+
+    if buffer.tell() > max_bytes:
+        raise ValueError(f"Não foi possível gerar um JPEG menor que {max_bytes} bytes.")
+    return buffer.getvalue()
+
+
+class ImagePreprocessingClass:
+    def __init__(self, s3_bucket=None, max_workers=None, min_side=REKOGNITION_MIN_SIDE):
+        """
+        Inicializa a classe ImagePreprocessingClass com os pools de processos e de threads.
+
+        :param s3_bucket: Instância de S3BucketClass para o upload opcional das imagens.
+        :param max_workers: Número de processos usados no pré-processamento (padrão: número de CPUs).
+        :param min_side: Menor lado, em pixels, das imagens enviadas ao Rekognition.
+        """
+        self.s3_bucket = s3_bucket
+        self.min_side = min_side
+
+        # Pool de processos para decodificar e redimensionar as imagens em paralelo
+        self.process_pool = ProcessPoolExecutor(max_workers=max_workers)
+
+        # Pool de threads para os uploads ao S3, que não bloqueiam a análise
+        self.upload_pool = ThreadPoolExecutor(max_workers=4)
+
+    def preprocess_images(self, sources):
+        """
+        Pré-processa várias imagens em paralelo no pool de processos.
+
+        :param sources: Lista de caminhos ou bytes das imagens originais.
+        :return: Lista com os bytes JPEG pré-processados, na mesma ordem de entrada.
+        """
+        min_sides = [self.min_side] * len(sources)
+        return list(self.process_pool.map(preprocess_image, sources, min_sides))
+
+    def upload_async(self, image_bytes, object_name):
+        """
+        Agenda o upload de uma imagem pré-processada para o S3 sem bloquear a chamada.
+
+        :param image_bytes: Bytes JPEG da imagem.
+        :param object_name: Nome do objeto no bucket S3.
+        :return: Future com a URL do arquivo no S3, ou None se não houver bucket configurado.
+        """
+        if self.s3_bucket is None:
+            return None
+        return self.upload_pool.submit(self.s3_bucket.upload_s3_bucket, io.BytesIO(image_bytes), object_name)
+
+    def analyze_images(self, rekognition_service, sources, object_names=None):
+        """
+        Pré-processa as imagens localmente e detecta rótulos enviando-as em bytes ao Rekognition.
+
+        :param rekognition_service: Instância de RekognitionService.
+        :param sources: Lista de caminhos ou bytes das imagens originais.
+        :param object_names: Nomes dos objetos no S3. Se informados, o upload é feito em segundo plano.
+        :return: Lista de tuplas (resposta do detect_labels, Future do upload ou None).
+        """
+        results = []
+        for index, image_bytes in enumerate(self.preprocess_images(sources)):
+            # Inicia o upload antes da análise para sobrepor a rede do S3 e do Rekognition
+            upload = None
+            if object_names is not None:
+                upload = self.upload_async(image_bytes, object_names[index])
+
+            response = rekognition_service.detect_labels(image_bytes=image_bytes)
+            results.append((response, upload))
+        return results
+
+    def close(self):
+        """
+        Encerra os pools de processos e de threads, aguardando os uploads pendentes.
+        """
+        self.process_pool.shutdown(wait=True)
+        self.upload_pool.shutdown(wait=True)
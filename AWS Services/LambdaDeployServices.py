@@ -0,0 +1,239 @@
+import os
+import io
+import sys
+import json
+import base64
+import hashlib
+import zipfile
+import tempfile
+import threading
+import subprocess
+import boto3
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Data fixa gravada em todas as entradas do zip para que o pacote seja reprodutível
+ZIP_FIXED_DATE = (1980, 1, 1, 0, 0, 0)
+
+# Permissão fixa (rw-r--r--) das entradas do zip
+ZIP_FILE_MODE = 0o644 << 16
+
+# Plataforma dos wheels instalados nos layers (runtime Linux x86_64 do Lambda)
+LAYER_PLATFORM = 'manylinux2014_x86_64'
+
+
+def build_zip(files, compression=zipfile.ZIP_STORED):
+    """
+    Gera um zip determinístico: mesma entrada, mesmos bytes (e mesmo SHA-256).
+
+    As entradas são ordenadas pelo nome e gravadas com data, permissões e sistema de origem
+    fixos. Com ZIP_STORED (padrão) os bytes são iguais em qualquer máquina; com ZIP_DEFLATED a
+    saída depende da build do zlib (ex.: zlib-ng, zlib da Apple) e só é garantida na mesma máquina.
+
+    :param files: Dicionário {nome_no_zip: conteúdo em bytes ou caminho do arquivo local}.
+    :param compression: zipfile.ZIP_STORED ou zipfile.ZIP_DEFLATED.
+    :return: Bytes do arquivo zip.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=compression, compresslevel=9) as zipf:
+        for name in sorted(files):
+            content = files[name]
+            if not isinstance(content, bytes):
+                with open(content, 'rb') as file:
+                    content = file.read()
+
+            info = zipfile.ZipInfo(name, date_time=ZIP_FIXED_DATE)
+            info.external_attr = ZIP_FILE_MODE
+            # Fixa o sistema de origem como Unix; o padrão depende do sistema operacional local
+            info.create_system = 3
+            info.compress_type = compression
+            zipf.writestr(info, content)
+    return buffer.getvalue()
+
+
+def zip_directory(directory, prefix=''):
+    """
+    Gera um zip comprimido e determinístico com todos os arquivos de um diretório.
+
+    Usado nos layers, que são identificados pelo hash das dependências e não pelo SHA-256
+    do zip, então a compressão não afeta o cache.
+
+    :param directory: Diretório local.
+    :param prefix: Prefixo dos nomes dentro do zip (ex.: 'python/' para layers).
+    :return: Bytes do arquivo zip.
+    """
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith('.pyc'):
+                continue
+            path = os.path.join(root, name)
+            files[prefix + os.path.relpath(path, directory).replace(os.sep, '/')] = path
+    return build_zip(files, compression=zipfile.ZIP_DEFLATED)
+
+
+def code_sha256(package):
+    """
+    Calcula o hash do pacote no mesmo formato do campo CodeSha256 do Lambda (SHA-256 em base64).
+
+    :param package: Bytes do arquivo zip.
+    :return: String base64 do SHA-256.
+    """
+    return base64.b64encode(hashlib.sha256(package).digest()).decode('ascii')
+
+
+class LambdaDeployClass:
+    def __init__(self, role_arn, cache_dir='.lambda_cache', max_workers=4):
+        """
+        Inicializa a classe LambdaDeployClass com o cliente do AWS Lambda e o cache de layers.
+
+        :param role_arn: ARN da role de execução usada na criação das funções.
+        :param cache_dir: Diretório local onde os layers de dependências ficam em cache.
+        :param max_workers: Número de funções implantadas em paralelo.
+        """
+        self.role_arn = role_arn
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+
+        # Inicia o serviço Lambda
+        self.lambda_client = boto3.client('lambda', region_name='us-east-1')
+
+        # Um lock por layer: implantações paralelas não publicam o mesmo layer duas vezes,
+        # mas layers com dependências diferentes são gerados ao mesmo tempo
+        self.layer_locks = {}
+        self.layer_locks_guard = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_dependency_layer(self, requirements, runtime='python3.10', platform=LAYER_PLATFORM):
+        """
+        Retorna o ARN de um layer com as dependências, publicando-o apenas se ainda não existir.
+
+        O layer é identificado pelo hash das dependências, do runtime e da plataforma; fixe as
+        versões (ex.: 'pillow==10.0.0') para que o mesmo hash sempre represente o mesmo conteúdo.
+        Os wheels são baixados para a plataforma do Lambda, e não para a máquina local.
+
+        :param requirements: Lista de dependências no formato do pip.
+        :param runtime: Runtime compatível do layer.
+        :param platform: Plataforma dos wheels (ex.: 'manylinux2014_aarch64' para funções arm64).
+        :return: ARN da versão do layer.
+        """
+        spec = '\n'.join(sorted(requirements)) + '\n' + runtime + '\n' + platform
+        layer_hash = hashlib.sha256(spec.encode('utf-8')).hexdigest()[:16]
+
+        with self.layer_locks_guard:
+            lock = self.layer_locks.setdefault(layer_hash, threading.Lock())
+        with lock:
+            return self._get_dependency_layer(layer_hash, requirements, runtime, platform)
+
+    def _get_dependency_layer(self, layer_hash, requirements, runtime, platform):
+        """
+        Resolve o layer de dependências a partir do cache local ou publica uma nova versão.
+        """
+        metadata_path = os.path.join(self.cache_dir, f"{layer_hash}.json")
+
+        # Layer já publicado com as mesmas dependências: reutiliza sem reinstalar nem reenviar
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as file:
+                return json.load(file)['LayerVersionArn']
+
+        # Instala as dependências em um diretório temporário e gera o zip no formato de layer
+        zip_path = os.path.join(self.cache_dir, f"{layer_hash}.zip")
+        if not os.path.exists(zip_path):
+            with tempfile.TemporaryDirectory() as target:
+                subprocess.run(
+                    [
+                        sys.executable, '-m', 'pip', 'install', '--quiet', '--target', target,
+                        '--platform', platform, '--only-binary=:all:', '--implementation', 'cp',
+                        '--python-version', runtime.replace('python', ''), *requirements
+                    ],
+                    check=True
+                )
+                with open(zip_path, 'wb') as file:
+                    file.write(zip_directory(target, prefix='python/'))
+
+        with open(zip_path, 'rb') as file:
+            response = self.lambda_client.publish_layer_version(
+                LayerName=f"deps-{layer_hash}",
+                Content={'ZipFile': file.read()},
+                CompatibleRuntimes=[runtime]
+            )
+
+        with open(metadata_path, 'w') as file:
+            json.dump({'LayerVersionArn': response['LayerVersionArn'], 'requirements': sorted(requirements), 'platform': platform}, file)
+        return response['LayerVersionArn']
+
+    def deploy_function(self, function_name, handler_path, handler='lambda_function.lambda_handler',
+                        runtime='python3.10', requirements=None):
+        """
+        Cria ou atualiza uma função Lambda, enviando o código apenas quando ele mudou.
+
+        O arquivo do handler é gravado no zip como lambda_function.py. Se o CodeSha256 da função
+        implantada for igual ao do novo pacote, o update_function_code não é chamado.
+
+        :param function_name: Nome da função Lambda.
+        :param handler_path: Caminho local do arquivo do handler (ex.: '07-Lambda/trigger.py').
+        :param handler: Handler no formato 'lambda_function.nome_da_funcao'.
+        :param runtime: Runtime da função.
+        :param requirements: Lista opcional de dependências, publicadas em um layer em cache.
+        :return: 'created', 'updated', 'unchanged' ou None em caso de erro.
+        """
+        package = build_zip({'lambda_function.py': handler_path})
+        sha256 = code_sha256(package)
+
+        try:
+            layers = [self.get_dependency_layer(requirements, runtime)] if requirements else []
+
+            try:
+                configuration = self.lambda_client.get_function(FunctionName=function_name)['Configuration']
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise
+
+                # A função ainda não existe: cria a função com o pacote e os layers
+                self.lambda_client.create_function(
+                    FunctionName=function_name,
+                    Runtime=runtime,
+                    Role=self.role_arn,
+                    Handler=handler,
+                    Code={'ZipFile': package},
+                    Layers=layers
+                )
+                print(f"Função {function_name} criada.")
+                return 'created'
+
+            status = 'unchanged'
+            deployed_layers = [layer['Arn'] for layer in configuration.get('Layers', [])]
+            if deployed_layers != layers or configuration.get('Handler') != handler:
+                self.lambda_client.update_function_configuration(
+                    FunctionName=function_name, Handler=handler, Layers=layers
+                )
+                # Aguarda a atualização da configuração antes de enviar o código
+                self.lambda_client.get_waiter('function_updated').wait(FunctionName=function_name)
+                status = 'updated'
+
+            # Só envia o código se o hash mudou
+            if configuration['CodeSha256'] != sha256:
+                self.lambda_client.update_function_code(FunctionName=function_name, ZipFile=package)
+                status = 'updated'
+
+            print(f"Função {function_name}: {status}.")
+            return status
+
+        except (BotoCoreError, ClientError, subprocess.CalledProcessError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro
+            print(f"Erro ao implantar a função {function_name}: {e}")
+            return None
+
+    def deploy_functions(self, functions):
+        """
+        Implanta várias funções Lambda em paralelo.
+
+        :param functions: Lista de dicionários com os argumentos de deploy_function, ex.:
+                          {'function_name': 'LambdaTrigger', 'handler_path': '07-Lambda/trigger.py',
+                           'handler': 'lambda_function.lambda_trigger'}.
+        :return: Dicionário {nome_da_função: status}.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda spec: self.deploy_function(**spec), functions)
+            return {spec['function_name']: status for spec, status in zip(functions, results)}
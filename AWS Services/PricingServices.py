@@ -0,0 +1,329 @@
+import json
+import sqlite3
+import boto3
+from datetime import datetime
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Esquema do catálogo local: produtos, atributos indexados e dimensões de preço
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    scope TEXT PRIMARY KEY,
+    publication_date TEXT,
+    refreshed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    sku TEXT PRIMARY KEY,
+    service_code TEXT NOT NULL,
+    product_family TEXT,
+    region_code TEXT,
+    usage_type TEXT,
+    publication_date TEXT,
+    attributes TEXT
+);
+CREATE TABLE IF NOT EXISTS product_attributes (
+    sku TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS prices (
+    sku TEXT NOT NULL,
+    term_type TEXT NOT NULL,
+    rate_code TEXT,
+    unit TEXT,
+    currency TEXT,
+    price_per_unit REAL,
+    begin_range REAL,
+    end_range REAL,
+    description TEXT,
+    term_attributes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_products_lookup ON products (service_code, region_code, usage_type);
+CREATE INDEX IF NOT EXISTS idx_attributes_lookup ON product_attributes (name, value, sku);
+CREATE INDEX IF NOT EXISTS idx_attributes_sku ON product_attributes (sku);
+CREATE INDEX IF NOT EXISTS idx_prices_sku ON prices (sku, term_type);
+"""
+
+
+def _parse_range(value):
+    """
+    Converte os limites de faixa do catálogo ('0', '1024', 'Inf') em float ou None (infinito).
+    """
+    if value is None or value == 'Inf':
+        return None
+    return float(value)
+
+
+def parse_price_list(price_list):
+    """
+    Converte as strings JSON do PriceList em produtos, uma de cada vez.
+
+    :param price_list: Iterável de strings JSON retornadas por get_products.
+    :return: Gerador de tuplas (produto, atributos, preços).
+    """
+    for raw_product in price_list:
+        document = json.loads(raw_product)
+        product = document['product']
+        attributes = product.get('attributes', {})
+
+        prices = []
+        for term_type, offers in document.get('terms', {}).items():
+            for offer in offers.values():
+                term_attributes = json.dumps(offer.get('termAttributes', {}))
+                for rate_code, dimension in offer.get('priceDimensions', {}).items():
+                    # Cada dimensão tem o preço em uma única moeda (normalmente USD)
+                    currency, amount = next(iter(dimension['pricePerUnit'].items()), (None, None))
+                    prices.append((
+                        product['sku'], term_type, rate_code, dimension.get('unit'), currency,
+                        float(amount) if amount is not None else None,
+                        _parse_range(dimension.get('beginRange')), _parse_range(dimension.get('endRange')),
+                        dimension.get('description'), term_attributes
+                    ))
+
+        row = (
+            product['sku'], document.get('serviceCode'), product.get('productFamily'),
+            attributes.get('regionCode'), attributes.get('usagetype'),
+            document.get('publicationDate'), json.dumps(attributes)
+        )
+        yield row, attributes, prices
+
+
+class PricingCatalogClass:
+    def __init__(self, db_path='pricing_catalog.db', region_name='us-east-1'):
+        """
+        Inicializa o catálogo local de preços da AWS em um banco SQLite indexado.
+
+        :param db_path: Caminho do arquivo SQLite (use ':memory:' para um catálogo temporário).
+        :param region_name: Região do endpoint da Pricing API ('us-east-1' ou 'ap-south-1').
+        """
+        # Inicia o serviço Pricing
+        self.pricing_client = boto3.client('pricing', region_name=region_name)
+
+        # Abre o banco local e garante que as tabelas e índices existam
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(CATALOG_SCHEMA)
+
+    def _remote_publication_date(self, service_code, filters):
+        """
+        Obtém a data de publicação atual do catálogo consultando um único produto.
+
+        :param service_code: Código do serviço (ex.: 'AmazonS3').
+        :param filters: Filtros TERM_MATCH aplicados na sincronização.
+        :return: Data de publicação ou None se o serviço não tiver produtos.
+        """
+        response = self.pricing_client.get_products(ServiceCode=service_code, Filters=filters, MaxResults=1)
+        for document in response['PriceList']:
+            return json.loads(document).get('publicationDate')
+        return None
+
+    def _stored_publication_date(self, scope):
+        """
+        Retorna a data de publicação gravada na última sincronização do escopo (serviço e região).
+        """
+        row = self.connection.execute(
+            'SELECT publication_date FROM catalog_meta WHERE scope = ?', (scope,)
+        ).fetchone()
+        return row['publication_date'] if row else None
+
+    def refresh(self, service_code, region_code=None, force=False):
+        """
+        Sincroniza os produtos de um serviço com o catálogo local.
+
+        A sincronização só baixa o catálogo quando a data de publicação da AWS mudou desde a
+        última execução. Os produtos são lidos com o paginador e gravados página a página.
+
+        :param service_code: Código do serviço (ex.: 'AmazonS3', 'AmazonEC2').
+        :param region_code: Região dos produtos (ex.: 'us-east-1'). Se None, todas as regiões.
+        :param force: Se True, baixa o catálogo mesmo sem nova publicação.
+        :return: Número de produtos gravados, 0 se o catálogo já estava atualizado, None em caso de erro.
+        """
+        filters = []
+        if region_code is not None:
+            filters.append({'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': region_code})
+
+        # Cada combinação de serviço e região sincronizada tem sua própria data de publicação
+        scope = f"{service_code}:{region_code or '*'}"
+
+        try:
+            # Compara a publicação remota com a publicação armazenada localmente
+            publication_date = self._remote_publication_date(service_code, filters)
+            if not force and publication_date is not None and publication_date == self._stored_publication_date(scope):
+                print(f"Catálogo de {service_code} já está atualizado ({publication_date}).")
+                return 0
+
+            count = 0
+            paginator = self.pricing_client.get_paginator('get_products')
+            with self.connection:
+                # Remove os produtos antigos do escopo sincronizado antes de gravar a nova versão
+                self._delete_products(service_code, region_code)
+
+                for page in paginator.paginate(ServiceCode=service_code, Filters=filters):
+                    products, attributes, prices = [], [], []
+                    for row, product_attributes, product_prices in parse_price_list(page['PriceList']):
+                        products.append(row)
+                        attributes.extend((row[0], name, value) for name, value in product_attributes.items())
+                        prices.extend(product_prices)
+
+                    # Grava a página inteira de uma vez, substituindo versões anteriores dos mesmos SKUs
+                    skus = [(row[0],) for row in products]
+                    self.connection.executemany('DELETE FROM product_attributes WHERE sku = ?', skus)
+                    self.connection.executemany('DELETE FROM prices WHERE sku = ?', skus)
+                    self.connection.executemany('INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?, ?)', products)
+                    self.connection.executemany('INSERT INTO product_attributes VALUES (?, ?, ?)', attributes)
+                    self.connection.executemany('INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', prices)
+                    count += len(products)
+
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO catalog_meta VALUES (?, ?, ?)',
+                    (scope, publication_date, datetime.utcnow().isoformat())
+                )
+
+            print(f"Catálogo de {service_code} sincronizado: {count} produtos.")
+            return count
+
+        except (BotoCoreError, ClientError) as e:
+            # Caso ocorra um erro, imprime a mensagem de erro
+            print(f"Erro ao sincronizar o catálogo de preços: {e}")
+            return None
+
+    def _delete_products(self, service_code, region_code=None):
+        """
+        Remove do banco local os produtos, atributos e preços de um serviço (e região).
+        """
+        query = 'SELECT sku FROM products WHERE service_code = ?'
+        params = [service_code]
+        if region_code is not None:
+            query += ' AND region_code = ?'
+            params.append(region_code)
+
+        skus = [(row['sku'],) for row in self.connection.execute(query, params)]
+        self.connection.executemany('DELETE FROM product_attributes WHERE sku = ?', skus)
+        self.connection.executemany('DELETE FROM prices WHERE sku = ?', skus)
+        self.connection.executemany('DELETE FROM products WHERE sku = ?', skus)
+
+    def find_products(self, service_code, region_code=None, usage_type=None, **attributes):
+        """
+        Busca produtos no catálogo local, equivalente aos filtros TERM_MATCH da Pricing API.
+
+        :param service_code: Código do serviço (ex.: 'AmazonS3').
+        :param region_code: Região dos produtos (ex.: 'us-east-1').
+        :param usage_type: Tipo de uso (atributo 'usagetype').
+        :param attributes: Outros atributos do produto, ex.: storageClass='General Purpose'.
+        :return: Lista de dicionários com sku, product_family, region_code, usage_type e attributes.
+        """
+        query = 'SELECT * FROM products WHERE service_code = ?'
+        params = [service_code]
+        if region_code is not None:
+            query += ' AND region_code = ?'
+            params.append(region_code)
+        if usage_type is not None:
+            query += ' AND usage_type = ?'
+            params.append(usage_type)
+
+        # Cada atributo extra vira uma busca no índice (name, value, sku)
+        for name, value in attributes.items():
+            query += ' AND sku IN (SELECT sku FROM product_attributes WHERE name = ? AND value = ?)'
+            params.extend([name, value])
+
+        products = []
+        for row in self.connection.execute(query, params):
+            product = dict(row)
+            product['attributes'] = json.loads(product['attributes'])
+            products.append(product)
+        return products
+
+    def get_prices(self, sku, term_type='OnDemand', offer=None, term_filter=None):
+        """
+        Retorna as dimensões de preço de um produto, opcionalmente de uma única oferta.
+
+        :param sku: SKU do produto.
+        :param term_type: Tipo de termo ('OnDemand' ou 'Reserved').
+        :param offer: Código da oferta (parte do meio do rate_code, ex.: 'JRTCKXETXF').
+        :param term_filter: Atributos do termo que a oferta deve ter, ex.:
+                            {'LeaseContractLength': '1yr', 'PurchaseOption': 'All Upfront'}.
+        :return: Lista de dicionários com oferta, unidade, moeda, preço e faixas, ordenada pelo início da faixa.
+        """
+        rows = self.connection.execute(
+            'SELECT * FROM prices WHERE sku = ? AND term_type = ? ORDER BY begin_range',
+            (sku, term_type)
+        )
+
+        prices = []
+        for row in rows:
+            price = dict(row)
+
+            # O rate_code tem o formato SKU.OFERTA.DIMENSAO
+            price['offer'] = price['rate_code'].split('.')[1]
+            if offer is not None and price['offer'] != offer:
+                continue
+
+            term_attributes = json.loads(price['term_attributes'])
+            if term_filter and any(term_attributes.get(name) != value for name, value in term_filter.items()):
+                continue
+            prices.append(price)
+        return prices
+
+    def estimate_cost(self, sku, quantity, term_type='OnDemand', offer=None, term_filter=None, unit=None):
+        """
+        Calcula o custo de uma quantidade de uso em uma única oferta do produto.
+
+        As faixas de preço são aplicadas apenas às dimensões na unidade de uso; taxas com
+        unidade 'Quantity' (ex.: pagamento adiantado de uma reserva) são somadas uma única vez.
+
+        :param sku: SKU do produto.
+        :param quantity: Quantidade de uso na unidade do produto (ex.: GB-Mo, Hrs).
+        :param term_type: Tipo de termo ('OnDemand' ou 'Reserved').
+        :param offer: Código da oferta; obrigatório (ou term_filter) quando o SKU tem várias ofertas.
+        :param term_filter: Atributos do termo que selecionam a oferta (ver get_prices).
+        :param unit: Unidade de uso; se None, usa a única unidade diferente de 'Quantity' da oferta.
+        :return: Custo total na moeda do catálogo.
+        :raises ValueError: Se nenhum preço corresponder aos filtros, se restar mais de uma oferta
+                            ou unidade de uso, ou se a unidade não existir na oferta.
+        """
+        prices = self.get_prices(sku, term_type, offer, term_filter)
+        if not prices:
+            raise ValueError(
+                f"Nenhum preço {term_type} encontrado para o SKU {sku} "
+                f"(offer={offer!r}, term_filter={term_filter!r})."
+            )
+
+        offers = {price['offer'] for price in prices}
+        if len(offers) > 1:
+            raise ValueError(f"O SKU {sku} tem {len(offers)} ofertas {term_type}; informe offer ou term_filter.")
+
+        if unit is None:
+            units = {price['unit'] for price in prices if price['unit'] != 'Quantity'}
+            if len(units) > 1:
+                raise ValueError(f"A oferta tem várias unidades de uso {sorted(units)}; informe unit.")
+            unit = units.pop() if units else None
+
+        total = 0.0
+        usage_priced = False
+        for price in prices:
+            # Taxas fixas são cobradas uma vez, independentemente do uso
+            if price['unit'] == 'Quantity':
+                total += price['price_per_unit']
+                continue
+            if price['unit'] != unit:
+                continue
+            usage_priced = True
+
+            begin = price['begin_range'] or 0.0
+            end = price['end_range'] if price['end_range'] is not None else float('inf')
+
+            # Cobra apenas a parte da quantidade que cai dentro desta faixa
+            billable = min(quantity, end) - begin
+            if billable > 0:
+                total += billable * price['price_per_unit']
+
+        # Uma unidade informada que não existe na oferta não pode virar um custo zero silencioso
+        if not usage_priced and total == 0.0:
+            units = sorted({price['unit'] for price in prices})
+            raise ValueError(f"A unidade {unit!r} não existe na oferta do SKU {sku}; unidades disponíveis: {units}.")
+        return total
+
+    def close(self):
+        """
+        Fecha a conexão com o banco local.
+        """
+        self.connection.close()
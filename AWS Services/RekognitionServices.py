@@ -7,24 +7,43 @@ class RekognitionService:
         Inicializa a classe RekognitionService e cria o cliente boto3 para o Amazon Rekognition.
         """
         self.rekognition = boto3.client('rekognition')
+
+    def _build_image(self, bucket=None, image_name=None, image_bytes=None):
+        """
+        Monta o parâmetro Image das APIs do Amazon Rekognition.
+
+        :param bucket: Nome do bucket do S3 onde a imagem está armazenada.
+        :param image_name: Nome do arquivo de imagem no bucket do S3.
+        :param image_bytes: Bytes da imagem (JPEG/PNG) já pré-processada localmente.
+        :return: Dicionário no formato {'Bytes': ...} ou {'S3Object': {...}}.
+        """
+        # Se os bytes da imagem forem informados, envia a imagem diretamente sem passar pelo S3
+        if image_bytes is not None:
+            return {'Bytes': image_bytes}
+
+        if bucket is None or image_name is None:
+            raise ValueError("Informe bucket e image_name ou image_bytes.")
+
+        return {
+            'S3Object': {
+                'Bucket': bucket,
+                'Name': image_name
+            }
+        }
    
-    def detect_labels(self, bucket, image_name):
+    def detect_labels(self, bucket=None, image_name=None, image_bytes=None):
         """
-        Detecta rótulos em uma imagem armazenada em um bucket do S3.
+        Detecta rótulos em uma imagem armazenada em um bucket do S3 ou enviada em bytes.
 
         :param bucket: Nome do bucket do S3 onde a imagem está armazenada.
         :param image_name: Nome do arquivo de imagem no bucket do S3.
+        :param image_bytes: Bytes da imagem, usados no lugar do S3 quando informados.
         :return: Resposta da API detect_labels do Amazon Rekognition.
         """
         try:
             # Chama a API detect_labels do Amazon Rekognition
             response = self.rekognition.detect_labels(
-                Image={
-                    'S3Object': {
-                        'Bucket': bucket,
-                        'Name': image_name
-                    }
-                },
+                Image=self._build_image(bucket, image_name, image_bytes),
                 MaxLabels=10,
                 MinConfidence=80,
                 Features=["GENERAL_LABELS", "IMAGE_PROPERTIES"],
@@ -37,23 +56,19 @@ class RekognitionService:
             print(f"Erro ao detectar rótulos: {e}")
             return None
 
-    def detect_text(self, bucket, image_name):
+    def detect_text(self, bucket=None, image_name=None, image_bytes=None):
         """
-        Detecta texto em uma imagem armazenada em um bucket do S3.
+        Detecta texto em uma imagem armazenada em um bucket do S3 ou enviada em bytes.
 
         :param bucket: Nome do bucket do S3 onde a imagem está armazenada.
         :param image_name: Nome do arquivo de imagem no bucket do S3.
+        :param image_bytes: Bytes da imagem, usados no lugar do S3 quando informados.
         :return: Lista de detecções de texto na imagem.
         """
         try:
             # Chama a API detect_text do Amazon Rekognition
             response = self.rekognition.detect_text(
-                Image={
-                    'S3Object': {
-                        'Bucket': bucket,
-                        'Name': image_name
-                    }
-                }
+                Image=self._build_image(bucket, image_name, image_bytes)
             )
 
             # Obtém as detecções de texto da resposta